@@ -11,28 +11,116 @@ Features:
     - Interactive chat with LLM for nutritional insights
 """
 
+import re
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from src.data_loader import DataLoader
 from src.data_processor import DataProcessor
 from src.data_visualizer import DataVisualizer
 from src.llm_service import LLMService
 
-def generate_stats(food_data, drinks_data):
+# number of filtered rows printed before asking to show the rest
+PREVIEW_ROWS = 50
+
+# comparison phrases recognised in chat questions, mapped to the filter operators of DataProcessor.filter_fast
+_COMPARISON_PHRASES = {
+    'more than': '>', 'greater than': '>', 'higher than': '>', 'over': '>', 'above': '>', '>': '>',
+    'less than': '<', 'fewer than': '<', 'lower than': '<', 'under': '<', 'below': '<', '<': '<',
+    'exactly': '==', 'equal to': '==', '==': '=='
+}
+_NUMBER = r'(\d+(?:\.\d+)?)'
+_COMPARISON_PATTERN = re.compile(
+    r'(' + '|'.join(re.escape(phrase) for phrase in _COMPARISON_PHRASES) + r')\s*' + _NUMBER
+)
+_BETWEEN_PATTERN = re.compile(r'between\s*' + _NUMBER + r'\s*(?:and|to|-)\s*' + _NUMBER)
+
+def load_datasets(food_data, drinks_data):
     """
-    Generate and display nutritional statistics for food and drinks datasets.
+    Load the food and drinks datasets concurrently.
     
-    Creates descriptive statistics, comparison data, and visualizations for both
-    datasets. Displays results to console and saves charts as PNG files.
+    Each dataset is read on its own thread, so reading and parsing the two
+    CSV files overlap. Datasets that are already loaded are not read again.
+    
+    Args:
+        food_data (DataLoader): Food dataset to load
+        drinks_data (DataLoader): Drinks dataset to load
+    """
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        list(executor.map(lambda data: data.df, (food_data, drinks_data))) # accessing df loads it, list() re-raises any error
+
+
+def build_data_processor(food_data, drinks_data):
+    """
+    Create a data processor holding the food and drinks datasets.
     
     Args:
         food_data (DataLoader): Loaded food dataset
         drinks_data (DataLoader): Loaded drinks dataset
-    """
         
-    # create data processor instance and add the datasets
+    Returns:
+        DataProcessor: Data processor with 'food' and 'drinks' datasets added
+    """
+
     data_processor = DataProcessor()
     data_processor.add_datasets('food', food_data.df)
     data_processor.add_datasets('drinks', drinks_data.df)
+    return data_processor
+
+
+def find_filtered_rows(data_processor, question):
+    """
+    Find the rows matching a nutrient threshold stated in a chat question.
+    
+    Recognises a nutrient column name together with a comparison and a number,
+    e.g. "under 400 calories" or "protein between 10 and 20", and filters every
+    dataset with that column. Questions naming only food or drinks are limited
+    to that dataset.
+    
+    Args:
+        data_processor (DataProcessor): Data processor holding the datasets
+        question (str): User's question
+        
+    Returns:
+        dict: Filtered DataFrames keyed by category, empty if the question
+            has no recognisable threshold
+    """
+
+    question = question.lower()
+
+    # get the comparison and the value(s) to compare with
+    between = _BETWEEN_PATTERN.search(question)
+    if between:
+        operator, value = 'between', (float(between.group(1)), float(between.group(2)))
+    else:
+        comparison = _COMPARISON_PATTERN.search(question)
+        if not comparison:
+            return {}
+        operator, value = _COMPARISON_PHRASES[comparison.group(1)], float(comparison.group(2))
+
+    # only filter the categories named in the question, or all of them if none are
+    categories = [c for c in data_processor.categories if c.rstrip('s') in question] or data_processor.categories
+
+    results = {}
+    for category in categories:
+        # the nutrient is matched as a word prefix, so 'carbs' finds the Carb column
+        column_lookup = data_processor.column_lookup[category]
+        nutrient = next((col for key, col in column_lookup.items() if re.search(rf'\b{re.escape(key)}', question)), None)
+        if nutrient is not None:
+            results[category] = data_processor.filter_fast(category, nutrient, operator, value)
+    return results
+
+
+def generate_stats(data_processor):
+    """
+    Generate and display nutritional statistics for food and drinks datasets.
+    
+    Creates descriptive statistics, comparison data, and visualizations for both
+    datasets. Displays results to console and saves charts as PNG files.
+    
+    Args:
+        data_processor (DataProcessor): Data processor holding both datasets
+    """
 
     # calculate descriptive stats and comparison stats
     descrp_stats = data_processor.calculate_descriptive_stats()
@@ -59,7 +147,7 @@ def generate_stats(food_data, drinks_data):
             continue
 
 
-def filter_data_mode(food_data, drinks_data):
+def filter_data_mode(data_processor):
     """
     Interactive filtering mode for dataset exploration.
     
@@ -67,14 +155,8 @@ def filter_data_mode(food_data, drinks_data):
     Results are displayed immediately and users can continue filtering or return to menu.
     
     Args:
-        food_data (DataLoader): Loaded food dataset
-        drinks_data (DataLoader): Loaded drinks dataset
+        data_processor (DataProcessor): Data processor holding both datasets
     """
-        
-    # create data processor instance and add the datasets
-    data_processor = DataProcessor()
-    data_processor.add_datasets('food', food_data.df)
-    data_processor.add_datasets('drinks', drinks_data.df)
 
     # check for prompted inputs
     # to exit to menu upon an invalid input
@@ -86,10 +168,12 @@ def filter_data_mode(food_data, drinks_data):
             return
         
         # get column input
-        available_columns = [col.lower() for col in data_processor.datasets[category].columns]
-        print("Here are the available columns to filter:", available_columns)
-        nutrient = input("Which nutrient/column do you want to filter by? ").strip().lower()
-        if nutrient not in available_columns:
+        # the lowercase names are mapped back to the actual column names, which works for multi-word columns too
+        column_lookup = data_processor.column_lookup[category]
+        print("Here are the available columns to filter:", list(column_lookup))
+        nutrient_input = input("Which nutrient/column do you want to filter by? ").strip().lower()
+        nutrient = column_lookup.get(nutrient_input)
+        if nutrient is None:
             print("Invalid column.\n")
             return
         
@@ -106,28 +190,38 @@ def filter_data_mode(food_data, drinks_data):
             return
 
         # filter the dataset based on the stated inputs above
-        filtered_df = data_processor.filter_dataset(category, nutrient.capitalize(), operator, value)
+        filtered_df = data_processor.filter_fast(category, nutrient, operator, value)
 
         # print the filtered result to console
+        # only a preview of large results is printed, as formatting every row is the slowest part of the loop
         print("\n")
         print("="*80)
         print("FILTERED RESULTS:")
         print("="*80)
         print("\n")
-        print(filtered_df)
+        is_truncated = len(filtered_df) > PREVIEW_ROWS
+        print(filtered_df.head(PREVIEW_ROWS) if is_truncated else filtered_df)
         print(f"\nTotal rows after filtering: {len(filtered_df)}\n")
+        if is_truncated:
+            print(f"Showing the first {PREVIEW_ROWS} rows, type 'all' to show every row\n")
     
         # check for returning to menu inputs or continue to filter
         print("Press Enter to continue filtering, or type 'quit', 'exit' or 'q' to return to menu\n")
 
         user_input = input()
 
+        # render the full result only when asked for
+        if is_truncated and user_input.strip().lower() == 'all':
+            print(filtered_df.to_string())
+            print("\nPress Enter to continue filtering, or type 'quit', 'exit' or 'q' to return to menu\n")
+            user_input = input()
+
         if user_input.strip().lower() in ['quit', 'exit', 'q']:
             print("Returning to menu...\n")
             break
 
 
-def interactive_mode(food_data, drinks_data):
+def interactive_mode(data_processor, food_data, drinks_data, llm):
     """
     Interactive chat mode with LLM for nutritional insights.
     
@@ -136,16 +230,17 @@ def interactive_mode(food_data, drinks_data):
     data-driven responses.
     
     Args:
+        data_processor (DataProcessor): Data processor holding both datasets
         food_data (DataLoader): Loaded food dataset
         drinks_data (DataLoader): Loaded drinks dataset
+        llm (LLMService): LLM service, shared across chat sessions so its
+            memoized responses are kept
     """
         
-    # create the context with the provided datas
-    context = f"food data:\n{food_data.df.to_string()}\n"
-    context += f"drinks data:\n{drinks_data.df.to_string()}"
-
-    # create a llm service instance
-    llm = LLMService()
+    # create the context from compact summaries of the datas, rather than the full datasets, to keep prompts small
+    # the summaries are cached on the dataloaders, so re-entering this mode is cheap
+    context = f"food data summary:\n{food_data.summary_text}\n"
+    context += f"drinks data summary:\n{drinks_data.summary_text}"
 
     print("\n====== Interactive Chat Mode ======")
     print("Feel free to ask questions about Starbuck's menu items (e.g. summarize the nutritional insights of the data, etc)")
@@ -163,10 +258,23 @@ def interactive_mode(food_data, drinks_data):
         if user_input.strip() == "":
             continue
 
-        response = llm.generate_response(user_input, context)
-
-        # print out the llm generated response to console
-        print(f"\nLLM: {response}\n")
+        # add the full rows of any menu items mentioned in the question to the prompt
+        # the summary context is left unchanged, so it stays a cacheable prefix across turns
+        prompt = user_input
+        for name, data in (('food', food_data), ('drinks', drinks_data)):
+            matching_rows = data.find_items(user_input)
+            if len(matching_rows) > 0:
+                prompt += f"\n\n{name} items mentioned in the question:\n{matching_rows.to_string()}"
+
+        # and the rows matching any nutrient threshold in the question, e.g. "under 400 calories"
+        for name, filtered_df in find_filtered_rows(data_processor, user_input).items():
+            prompt += f"\n\n{name} items matching the question's criteria:\n{filtered_df.to_string()}"
+
+        # print out the llm generated response to console, as it is being generated
+        print("\nLLM: ", end="", flush=True)
+        for text in llm.generate_response(prompt, context, stream=True):
+            print(text, end="", flush=True)
+        print("\n")
 
 
 def main():
@@ -188,6 +296,13 @@ def main():
     food_data = DataLoader(food_csv_path)
     drinks_data = DataLoader(drinks_csv_path)
 
+    # the data processor is shared by every mode, so its memoized stats survive between menu entries
+    # the datasets are loaded (in parallel) and the processor built only once a mode needs them
+    data_processor = None
+
+    # the llm service is likewise created on first entering the chat, and kept so its memoized responses survive
+    llm = None
+
     while True:
         # menu interface
         print("="*40)
@@ -203,12 +318,18 @@ def main():
         # get the stated choice from user input and perform accordingly
         choice = input().strip()
 
+        if choice in ("1", "2", "3") and data_processor is None:
+            load_datasets(food_data, drinks_data)
+            data_processor = build_data_processor(food_data, drinks_data)
+
         if choice == "1":
-            generate_stats(food_data, drinks_data)
+            generate_stats(data_processor)
         elif choice == "2":
-            filter_data_mode(food_data, drinks_data)
+            filter_data_mode(data_processor)
         elif choice == "3":
-            interactive_mode(food_data, drinks_data)
+            if llm is None:
+                llm = LLMService()
+            interactive_mode(data_processor, food_data, drinks_data, llm)
         elif choice == "4":
             print("\nGoodbye! Thank you for using the application.")
             exit()
@@ -217,5 +338,6 @@ def main():
             continue
 
 
-# run main
-main()
+# run main, guarded so the chart worker processes can import this module without starting the menu
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Compiled filter kernels for nutritional data filtering.
+
+This module provides Numba-compiled kernels that build the boolean mask for
+the comparison filters in a single parallel pass over a column's NumPy array.
+Numba is optional, when it isn't installed HAS_NUMBA is False and the kernels
+are not defined.
+
+Functions:
+    compute_mask: Builds the boolean mask for a comparison operator
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+if HAS_NUMBA:
+    # compiled kernels are cached to disk, so they are only compiled once per column dtype
+    # comparisons with NaN are False, which matches the pandas boolean mask behaviour
+
+    @njit(cache=True, parallel=True)
+    def mask_gt(a, v):
+        """
+        Build the mask of the values greater than v.
+
+        Args:
+            a (np.ndarray): 1-D numeric array of the column to filter on
+            v (float): Value for comparison
+
+        Returns:
+            np.ndarray: Boolean mask
+        """
+
+        out = np.empty(a.shape, np.bool_)
+        for i in prange(a.size):
+            out[i] = a[i] > v
+        return out
+
+
+    @njit(cache=True, parallel=True)
+    def mask_lt(a, v):
+        """
+        Build the mask of the values less than v.
+
+        Args:
+            a (np.ndarray): 1-D numeric array of the column to filter on
+            v (float): Value for comparison
+
+        Returns:
+            np.ndarray: Boolean mask
+        """
+
+        out = np.empty(a.shape, np.bool_)
+        for i in prange(a.size):
+            out[i] = a[i] < v
+        return out
+
+
+    @njit(cache=True, parallel=True)
+    def mask_eq(a, v):
+        """
+        Build the mask of the values equal to v.
+
+        Args:
+            a (np.ndarray): 1-D numeric array of the column to filter on
+            v (float): Value for comparison
+
+        Returns:
+            np.ndarray: Boolean mask
+        """
+
+        out = np.empty(a.shape, np.bool_)
+        for i in prange(a.size):
+            out[i] = a[i] == v
+        return out
+
+
+    @njit(cache=True, parallel=True)
+    def mask_between(a, lo, hi):
+        """
+        Build the mask of the values between lo and hi, inclusive.
+
+        Args:
+            a (np.ndarray): 1-D numeric array of the column to filter on
+            lo (float): Minimum value
+            hi (float): Maximum value
+
+        Returns:
+            np.ndarray: Boolean mask
+        """
+
+        out = np.empty(a.shape, np.bool_)
+        for i in prange(a.size):
+            out[i] = lo <= a[i] and a[i] <= hi
+        return out
+
+
+    _MASK_KERNELS = {
+        '>': mask_gt,
+        '<': mask_lt,
+        '==': mask_eq
+    }
+
+
+def compute_mask(arr, operator, value):
+    """
+    Build the boolean mask for a comparison filter with the compiled kernels.
+
+    Args:
+        arr (np.ndarray): 1-D numeric array of the column to filter on
+        operator (str): Comparison operator ('>', '<', '==', 'between')
+        value (float or tuple): Value for comparison. For 'between' operator,
+            provide tuple (min_value, max_value)
+
+    Returns:
+        np.ndarray: Boolean mask, or None if the kernels can't be used
+            (Numba not installed, non-numeric column or unknown operator)
+    """
+
+    # only plain numeric arrays can be passed to the kernels
+    if not HAS_NUMBA or arr.dtype.kind not in 'fiu':
+        return None
+
+    # compare floats at the column's precision (as numpy does for float32 columns), and integers as floats
+    cast = arr.dtype.type if arr.dtype.kind == 'f' else float
+
+    if operator == 'between':
+        return mask_between(arr, cast(value[0]), cast(value[1]))
+
+    kernel = _MASK_KERNELS.get(operator)
+    if kernel is None:
+        return None
+    return kernel(arr, cast(value))
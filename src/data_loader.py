@@ -10,8 +10,63 @@ Classes:
 """
 
 import os
+import re
+import codecs
+import functools
+import unicodedata
 import pandas as pd
-import chardet as cd
+
+# prefer the faster encoding detectors when installed, they share chardet's detect() interface
+try:
+    import cchardet as cd
+except ImportError:
+    try:
+        import charset_normalizer as cd
+    except ImportError:
+        import chardet as cd
+
+# use pyarrow's multi-threaded csv parser when installed, otherwise pandas' default c parser
+try:
+    import pyarrow # noqa: F401
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
+
+# number of bytes read from the start of a file to detect its encoding
+ENCODING_SAMPLE_SIZE = 64 * 1024
+
+# byte order marks that identify an encoding without running the detector
+# utf-32 is checked before utf-16, since the utf-32 le bom starts with the utf-16 le bom
+_BOM_ENCODINGS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# number of highest and lowest items listed per nutrient in the text summary
+SUMMARY_TOP_K = 5
+
+
+def _normalize_name(text):
+    """
+    Helper function to normalize an item name or question for matching.
+    
+    Drops trademark symbols, folds accented characters to plain ASCII
+    (e.g. 'Crème' -> 'creme'), lowercases and collapses runs of whitespace.
+    
+    Args:
+        text (str): Text to normalize
+        
+    Returns:
+        str: Normalized text
+    """
+
+    text = text.replace('™', '').replace('®', '')
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'\s+', ' ', text).strip().lower()
+
 
 class DataLoader:
     """
@@ -22,12 +77,16 @@ class DataLoader:
     
     Attributes:
         csv_path (str): Path to the CSV file
-        df (pd.DataFrame): Loaded and cleaned DataFrame
+        df (pd.DataFrame): Loaded and cleaned DataFrame, loaded on first access
+        summary_text (str): Cached compact text summary of the DataFrame
+        item_names (list): Cached normalized item names, used to match questions
     """
      
     def __init__(self, csv_path):
         """
-        Initialize DataLoader and load data from CSV file.
+        Initialize DataLoader for a CSV file.
+        
+        The data itself is loaded lazily, the first time df is accessed.
         
         Args:
             csv_path (str): Path to the CSV file to load
@@ -36,10 +95,36 @@ class DataLoader:
             FileNotFoundError: If the CSV file doesn't exist at the specified path
         """
 
+        # check if the file path exist, so a bad path still fails on creation rather than first use
+        if not os.path.exists(csv_path):
+            raise FileNotFoundError(f"CSV file not found at path: {csv_path}")
+
         # initliaze class members
         self.csv_path = csv_path
         self.df = None
-        self.load_data() # load data from the provided csv path
+
+
+    @property
+    def df(self):
+        """
+        Loaded and cleaned DataFrame, read from the CSV file on first access.
+        
+        Returns:
+            pd.DataFrame: The dataset
+        """
+
+        if self._df is None:
+            self.load_data()
+        return self._df
+
+
+    @df.setter
+    def df(self, value):
+        self._df = value
+
+        # drop anything cached from a previously loaded dataframe
+        for cached_attr in ('summary_text', 'item_names'):
+            self.__dict__.pop(cached_attr, None)
 
 
     def load_data(self):
@@ -49,10 +134,11 @@ class DataLoader:
         Performs the following operations:
         - Validates file existence
         - Detects file encoding automatically
-        - Loads CSV with first column as index
+        - Loads CSV with first column as index (using pyarrow when available)
         - Handles missing values (treats '-' as NaN)
         - Strips whitespace from column names
         - Removes units and special characters from column names
+        - Downcasts float columns to float32
         
         Raises:
             FileNotFoundError: If CSV file not found at specified path
@@ -64,9 +150,78 @@ class DataLoader:
         
         # handle formatting issues and extract the data and store in dataframe
         detected_encoding = self.detect_encoding(self.csv_path)
-        self.df = pd.read_csv(self.csv_path, index_col=0, na_values='-', encoding=detected_encoding)
+        self.df = pd.read_csv(self.csv_path, index_col=0, na_values='-', encoding=detected_encoding, engine=CSV_ENGINE)
         self.df.columns = self.df.columns.str.strip() # strip leading/trailing whitespace from column names
-        self.df.columns = self.df.columns.str.replace(r'\s*\(.*\)|[.]', '', regex=True) # standardise the column names, by removing anything in parentheses
+        # standardise the column names, by removing anything in parentheses and any dots
+        cols = self.df.columns.str.split('(', n=1).str.get(0).str.rstrip()
+        self.df.columns = cols.str.replace('.', '', regex=False)
+
+        # downcast the float columns to float32, to reduce memory use
+        # integer columns are left as is, since int8/int16 arithmetic silently wraps around
+        for col in self.df.select_dtypes('float').columns:
+            self.df[col] = pd.to_numeric(self.df[col], downcast='float')
+
+
+    @functools.cached_property
+    def summary_text(self):
+        """
+        Compact text summary of the loaded DataFrame.
+        
+        Contains the descriptive statistics and the SUMMARY_TOP_K items with the
+        highest and lowest value for each nutrient. Much shorter than the full
+        DataFrame, which keeps LLM prompts small. Computed once on first access.
+        
+        Returns:
+            str: Summary of the dataset
+        """
+
+        summary = f"{self.df.describe().to_string()}\n"
+
+        # list the items with their values, all NaN columns have no highest/lowest items
+        for nutrient, values in self.df.select_dtypes('number').items():
+            values = values.dropna()
+            if values.empty:
+                continue
+            highest = values.nlargest(SUMMARY_TOP_K)
+            lowest = values.nsmallest(SUMMARY_TOP_K)
+            summary += f"\n{nutrient}:\n"
+            summary += "  highest: " + ", ".join(f"{item} ({value:g})" for item, value in highest.items()) + "\n"
+            summary += "  lowest: " + ", ".join(f"{item} ({value:g})" for item, value in lowest.items()) + "\n"
+        return summary
+
+
+    @functools.cached_property
+    def item_names(self):
+        """
+        Normalized item names of the loaded DataFrame, in index order.
+        
+        Computed once on first access, so matching a question only has to
+        normalize the question itself.
+        
+        Returns:
+            list: Item names normalized by _normalize_name
+        """
+
+        return [_normalize_name(name) for name in self.df.index.astype(str)]
+
+
+    def find_items(self, text):
+        """
+        Find the rows whose item name is mentioned in a piece of text.
+        
+        Names and text are matched case-insensitively, ignoring trademark
+        symbols, accents and extra whitespace.
+        
+        Args:
+            text (str): Text to search for item names (e.g., a user question)
+            
+        Returns:
+            pd.DataFrame: Rows of the items mentioned in the text
+        """
+
+        text = _normalize_name(text)
+        mentioned = [name in text for name in self.item_names]
+        return self.df[mentioned]
 
 
     @staticmethod
@@ -74,8 +229,12 @@ class DataLoader:
         """
         Helper function to detect the character encoding of a CSV file.
         
-        Uses the chardet library to automatically detect the file encoding,
-        which helps handle files with different character sets (UTF-8, Latin-1, etc.).
+        Files starting with a byte order mark are resolved directly from it,
+        and files that decode as UTF-8 are treated as UTF-8. Otherwise the
+        encoding detector (cchardet or charset-normalizer if installed, chardet
+        otherwise) is run on the first ENCODING_SAMPLE_SIZE bytes of the file,
+        which is enough for it to settle on an encoding without reading large
+        files into memory.
         
         Args:
             csv_path (str): Path to the CSV file
@@ -85,4 +244,18 @@ class DataLoader:
         """
 
         with open(csv_path, 'rb') as f:
-            return cd.detect(f.read())['encoding']
\ No newline at end of file
+            sample = f.read(ENCODING_SAMPLE_SIZE)
+
+        for bom, encoding in _BOM_ENCODINGS:
+            if sample.startswith(bom):
+                return encoding
+
+        # valid utf-8 is taken as is, since the detectors can mistake it for a single byte encoding
+        # the incremental decoder tolerates a multi-byte character cut off at the end of the sample
+        try:
+            codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+            return 'utf-8'
+        except UnicodeDecodeError:
+            pass
+
+        return cd.detect(sample)['encoding']
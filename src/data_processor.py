@@ -10,6 +10,66 @@ Classes:
 """
 
 import numpy as np
+from src._filters import HAS_NUMBA, compute_mask
+
+# numexpr is optional, when installed filters are evaluated through DataFrame.query with it
+try:
+    import numexpr # noqa: F401
+    HAS_NUMEXPR = True
+except ImportError:
+    HAS_NUMEXPR = False
+
+# metrics reported for every nutrient by compare_datasets, and the placeholder used when a nutrient is missing
+COMPARISON_METRICS = ('count', 'mean', 'median', 'std', 'min', 'max', '25%', '50%', '75%')
+NAN_ROW = {metric: np.nan for metric in COMPARISON_METRICS}
+
+# columns summed for the nutritional ratios in calculate_descriptive_stats
+_RATIO_COLS = ('Fat', 'Protein', 'Carb')
+
+# operators accepted by the filters, anything else is rejected before filtering
+FILTER_OPERATORS = ('>', '<', '==', 'between')
+
+# numpy comparisons for the single value filter operators, used when the compiled kernels aren't available
+_NUMPY_COMPARISONS = {
+    '>': np.greater,
+    '<': np.less,
+    '==': np.equal
+}
+
+# query expressions for the filter operators, used by filter_data when numexpr is installed
+# values are referenced as local variables (@value, @low, @high), rather than formatted into the expression
+_QUERY_EXPRESSIONS = {
+    '>': '`{nutrient}` > @value',
+    '<': '`{nutrient}` < @value',
+    '==': '`{nutrient}` == @value',
+    'between': '@low <= `{nutrient}` <= @high'
+}
+
+
+def _build_mask(arr, operator, value):
+    """
+    Helper function to build the boolean mask for a filter on a column array.
+    
+    Uses the compiled Numba kernels when available, and NumPy otherwise.
+    Comparisons with NaN are False, as with a pandas boolean mask.
+    
+    Args:
+        arr (np.ndarray): 1-D array of the column to filter on
+        operator (str): Comparison operator, one of FILTER_OPERATORS
+        value (float or tuple): Value for comparison. For 'between' operator,
+            provide tuple (min_value, max_value)
+            
+    Returns:
+        np.ndarray: Boolean mask
+    """
+
+    mask = compute_mask(arr, operator, value)
+    if mask is not None:
+        return mask
+
+    if operator == 'between':
+        return (arr >= value[0]) & (arr <= value[1])
+    return _NUMPY_COMPARISONS[operator](arr, value)
 
 class DataProcessor:
     """
@@ -22,6 +82,8 @@ class DataProcessor:
     Attributes:
         datasets (dict): Dictionary of DataFrames, keyed by category name
         categories (list): List of category names in the order they were added
+        column_lookup (dict): Per category, a dictionary mapping lowercase column
+            names to the actual column names
     """
 
     def __init__(self):
@@ -29,9 +91,17 @@ class DataProcessor:
         # initialize class member
         self.datasets = {}
         self.categories = []
+        self.column_lookup = {}
 
+        # column name sets per category, and the memoized results, cleared whenever a dataset is added
+        self._col_sets = {}
+        self._col_arrays = {}
+        self._common_nutrients = None
+        self._descriptive_stats = None
+        self._comparisons = {}
 
-    def add_datasets(self, catergory, df):
+
+    def add_datasets(self, category, df):
         """
         Add a dataset for a specific category.
         
@@ -40,8 +110,17 @@ class DataProcessor:
             df (pd.DataFrame): DataFrame containing nutritional data
         """
                 
-        self.datasets[catergory] = df # add dataset into the datasets dictionary, with the key as the category
-        self.categories.append(catergory) # append to the list of categories
+        self.datasets[category] = df # add dataset into the datasets dictionary, with the key as the category
+        if category not in self.categories:
+            self.categories.append(category) # append to the list of categories, once per category
+        self._col_sets[category] = frozenset(df.columns) # hashed once here, for the column lookups in compare_datasets
+        self.column_lookup[category] = {col.lower(): col for col in df.columns} # for case-insensitive column lookups
+        self._col_arrays[category] = {col: df[col].to_numpy() for col in df.columns} # raw column arrays for filter_fast
+
+        # the datasets changed, so any memoized stats are stale
+        self._common_nutrients = None
+        self._descriptive_stats = None
+        self._comparisons = {}
 
     def calculate_descriptive_stats(self):
         """
@@ -49,7 +128,7 @@ class DataProcessor:
         
         Computes standard statistics (count, mean, std, min, max, quartiles) and
         nutritional ratios (fat-to-protein, protein-to-carb, carb-to-fat) for each
-        category.
+        category. The result is memoized until another dataset is added.
         
         Returns:
             dict: Nested dictionary containing:
@@ -66,6 +145,10 @@ class DataProcessor:
             }
         """
                 
+        # reuse the previous result if the datasets havent changed
+        if self._descriptive_stats is not None:
+            return self._descriptive_stats
+
         stats = {}
 
         # for every category, compute the nutrients descriptive stats and ratio stats
@@ -77,15 +160,16 @@ class DataProcessor:
             }
 
             # ratios
-            if 'Fat' in nutrient.columns and 'Protein' in nutrient.columns and 'Carb' in nutrient.columns:
-                fat_sum = nutrient['Fat'].sum()
-                protein_sum = nutrient['Protein'].sum()
-                carb_sum = nutrient['Carb'].sum()
+            # sum the three columns in one reduction, and leave a ratio as NaN if its denominator is zero
+            if all(col in nutrient.columns for col in _RATIO_COLS):
+                sums = nutrient[list(_RATIO_COLS)].sum(numeric_only=True)
+                fat_sum, protein_sum, carb_sum = sums['Fat'], sums['Protein'], sums['Carb']
 
-                stats[category]['ratio']['fat_to_protein'] = fat_sum / protein_sum
-                stats[category]['ratio']['protein_to_carb'] = protein_sum / carb_sum
-                stats[category]['ratio']['carb_to_fat'] = carb_sum / fat_sum
+                stats[category]['ratio']['fat_to_protein'] = fat_sum / protein_sum if protein_sum else np.nan
+                stats[category]['ratio']['protein_to_carb'] = protein_sum / carb_sum if carb_sum else np.nan
+                stats[category]['ratio']['carb_to_fat'] = carb_sum / fat_sum if fat_sum else np.nan
 
+        self._descriptive_stats = stats
         return stats
 
 
@@ -112,7 +196,9 @@ class DataProcessor:
                 }
                 
         Note:
-            Returns None if fewer than 2 datasets are available for comparison.
+            Returns None if fewer than 2 datasets are available for comparison,
+            and an empty dictionary per category if there are no nutrients to compare.
+            Results are memoized per nutrients list until another dataset is added.
         """
                 
         # check if there is sufficient datasets for comparison
@@ -123,43 +209,52 @@ class DataProcessor:
         # default nutrients if none is defined, only considers common nutrients between categories, for comparison purpose
         # otherwise the stated nutrients will be used
         # and only the stated metrics data will be used for comparison
+        # the common nutrients are memoized, in the column order of the first dataset
         if nutrients is None:
-            all_cols = [set(df.columns) for df in self.datasets.values()]
-            nutrients = list(set.intersection(*all_cols))
+            if self._common_nutrients is None:
+                common = frozenset.intersection(*self._col_sets.values())
+                first_df = next(iter(self.datasets.values()))
+                self._common_nutrients = [col for col in first_df.columns if col in common]
+            nutrients = self._common_nutrients
+
+        # nothing to compare, so skip computing anything
+        if not nutrients:
+            return {category: {} for category in self.datasets}
+
+        # reuse the previous result for the same nutrients if the datasets havent changed
+        cache_key = tuple(nutrients)
+        if cache_key in self._comparisons:
+            return self._comparisons[cache_key]
         
         comparison = {}
     
-        # for every category, compute the nutrients descriptive stats
+        # for every category, compute the nutrients descriptive stats in a single describe() pass
         # Nan value if nutrient doesnt exist
         for category, df in self.datasets.items():
+            columns = self._col_sets[category]
+            present = [nutrient for nutrient in nutrients if nutrient in columns]
+            if present: # describe() raises on a DataFrame without columns
+                desc = df[present].describe(percentiles=[.25, .5, .75]).round(2)
+
             comparison[category] = {}
-            
             for nutrient in nutrients:
-                if nutrient in df.columns:
+                if nutrient in columns:
+                    col = desc[nutrient]
                     comparison[category][nutrient] = {
-                        'count': int(df[nutrient].count()),
-                        'mean': round(df[nutrient].mean(), 2),
-                        'median': round(df[nutrient].median(), 2),
-                        'std': round(df[nutrient].std(), 2),
-                        'min': round(df[nutrient].min(), 2),
-                        'max': round(df[nutrient].max(), 2),
-                        '25%': round(df[nutrient].quantile(0.25), 2),
-                        '50%': round(df[nutrient].quantile(0.50), 2),
-                        '75%': round(df[nutrient].quantile(0.75), 2)
+                        'count': int(col['count']),
+                        'mean': col['mean'],
+                        'median': col['50%'], # median is the same as the 50th percentile
+                        'std': col['std'],
+                        'min': col['min'],
+                        'max': col['max'],
+                        '25%': col['25%'],
+                        '50%': col['50%'],
+                        '75%': col['75%']
                     }
                 else:
-                    comparison[category][nutrient] = {
-                        'count': np.nan,
-                        'mean': np.nan,
-                        'median': np.nan,
-                        'std': np.nan,
-                        'min': np.nan,
-                        'max': np.nan,
-                        '25%': np.nan,
-                        '50%': np.nan,
-                        '75%': np.nan
-                    }
+                    comparison[category][nutrient] = dict(NAN_ROW)
 
+        self._comparisons[cache_key] = comparison
         return comparison
 
 
@@ -186,13 +281,13 @@ class DataProcessor:
         # for each category, filter the dataset based on the criteria
         # criteria is defined by the type of categories, nutrient, operator, and value
         filtered_datasets = {}
-        for catergory in categories:
-            filtered_datasets[catergory] = self.filter_data(self.datasets[catergory], nutrient, operator, value)
+        for category in categories:
+            filtered_datasets[category] = self.filter_data(self.datasets[category], nutrient, operator, value)
 
         return filtered_datasets
     
 
-    def filter_dataset(self, catergory, nutrient, operator, value):
+    def filter_dataset(self, category, nutrient, operator, value):
         """
         Helper function to filter a single dataset based on nutritional criteria.
         
@@ -210,21 +305,62 @@ class DataProcessor:
         """
                 
         # check if theres any category to filter
-        if catergory not in self.categories:
-            raise ValueError(f"'{catergory}' not found in datasets")
+        if category not in self.categories:
+            raise ValueError(f"'{category}' not found in datasets")
         
         # extract the category's data and filter it
-        df = self.datasets[catergory]
+        df = self.datasets[category]
         return self.filter_data(df, nutrient, operator, value)
     
 
+    def filter_fast(self, category, nutrient, operator, value):
+        """
+        Filter a single dataset using its cached NumPy column arrays.
+        
+        Same criteria and result as filter_dataset, but the boolean mask is
+        computed directly on the raw column array (with the compiled Numba
+        kernels when available), skipping the pandas overhead per comparison.
+        
+        Args:
+            category (str): Category name (e.g., 'food', 'drinks')
+            nutrient (str): Column name to filter on
+            operator (str): Comparison operator ('>', '<', '==', 'between')
+            value (float or tuple): Value for comparison. For 'between' operator,
+                provide tuple (min_value, max_value)
+            
+        Returns:
+            pd.DataFrame: Filtered DataFrame. Returns original DataFrame if
+                operator is not recognized.
+            
+        Raises:
+            ValueError: If category doesn't exist in datasets
+            KeyError: If nutrient isn't a column of the dataset
+        """
+
+        # check if theres any category to filter
+        if category not in self.categories:
+            raise ValueError(f"'{category}' not found in datasets")
+
+        df = self.datasets[category]
+        if operator not in FILTER_OPERATORS:
+            print("operator not recognized.")
+            return df
+
+        return df[_build_mask(self._col_arrays[category][nutrient], operator, value)]
+
+
     @staticmethod
     def filter_data(df, nutrient, operator, value):
         """
         Helper function to apply filter criteria to a DataFrame.
         
         Static method that performs the actual filtering logic. Can be used
-        independently of class instance.
+        independently of class instance. Uses the compiled Numba kernels when
+        Numba is installed, then DataFrame.query with the numexpr engine when
+        numexpr is installed, and a boolean mask otherwise.
+        
+        Used by filter_datasets and filter_dataset. The application's filter
+        and chat modes go through filter_fast instead.
         
         Args:
             df (pd.DataFrame): DataFrame to filter
@@ -242,17 +378,23 @@ class DataProcessor:
             >>> filtered = DataProcessor.filter_data(df, 'Protein', 'between', (10, 20))
         """
 
-        # filter the data based on the stated nutrient, operator and value
-        if operator == '>':
-            return df[df[nutrient] > value]
-        elif operator == '<':
-            return df[df[nutrient] < value]
-        elif operator == '==':
-            return df[df[nutrient] == value]
-        elif operator == 'between':
-            return df[df[nutrient].between(value[0], value[1])]
-        print("operator not recognized.")
-        return df
+        # check the operator against the whitelist before building any expression
+        if operator not in FILTER_OPERATORS:
+            print("operator not recognized.")
+            return df
 
+        if nutrient not in df.columns:
+            raise KeyError(nutrient) # same error as the boolean mask path for an unknown column
 
+        # without the compiled kernels, filter with numexpr via DataFrame.query when its available
+        # the @ references in the expression are passed explicitly, rather than looked up in this frame
+        if HAS_NUMEXPR and not HAS_NUMBA:
+            if operator == 'between':
+                local_dict = {'low': value[0], 'high': value[1]}
+            else:
+                local_dict = {'value': value}
+            expr = _QUERY_EXPRESSIONS[operator].format(nutrient=nutrient)
+            return df.query(expr, engine='numexpr', local_dict=local_dict)
 
+        # otherwise filter the data with a boolean mask, based on the stated nutrient, operator and value
+        return df[_build_mask(df[nutrient].to_numpy(), operator, value)]
@@ -8,10 +8,90 @@ Classes:
     DataVisualizer: Creates text displays and charts for nutritional data
 """
 
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 import pandas as pd
 import numpy as np
+import matplotlib
+
+# charts are only saved to file by default, using the non-interactive Agg backend which needs no GUI
+# set AMARIS_INTERACTIVE=1 to also display them on screen
+INTERACTIVE = os.environ.get("AMARIS_INTERACTIVE", "").strip().lower() in ("1", "true", "yes")
+if not INTERACTIVE:
+    matplotlib.use("Agg")
+
 import matplotlib.pyplot as plt
 
+# available colors for the bars of the bar charts
+_PALETTE = ("#ff0000", "#0033ff", "#00ff00", "#ff8000", "#ff0080", "#8000ff", "#fffb00", "#00f7ff")
+
+
+def _bar_color(i, num_series):
+    """
+    Pick the bar color for a series of a grouped bar chart.
+    
+    Args:
+        i (int): Index of the series
+        num_series (int): Number of series in the chart
+        
+    Returns:
+        Color from the palette, or from the tab20 colormap when there are
+        more series than palette colors
+    """
+
+    if num_series > len(_PALETTE):
+        return plt.cm.tab20(i % 20)
+    return _PALETTE[i]
+
+
+def _bar_layout(vals):
+    """
+    Compute the bar positions and width for a grouped bar chart.
+    
+    Args:
+        vals (np.ndarray): 2D array of bar heights, one row per series
+            (grouped bars) and one column per x axis position
+            
+    Returns:
+        tuple: (positions, bar_width), where positions is a 2D array of the
+            same shape as vals, with the x position of every bar
+    """
+
+    num_series, num_x = vals.shape
+    bar_width = 0.8 / max(num_series, 1) # bar width for each of the series at an x position
+    offsets = (np.arange(num_series) - num_series/2) * bar_width + bar_width/2 # bar offsets to center each group around its x position
+    positions = np.arange(num_x) + offsets[:, np.newaxis]
+    return positions, bar_width
+
+
+def _render_category_chart(category, describe_df, metrics, output_filename):
+    """
+    Helper function to render a single category's descriptive stats chart to a file.
+    
+    Runs in a worker process for DataVisualizer.plot_descriptive_stats in
+    parallel mode, so it is a module level function that can be pickled.
+    
+    Args:
+        category (str): Category name for the title
+        describe_df (pd.DataFrame): DataFrame from pd.DataFrame.describe()
+        metrics (list): List of metric names to plot
+        output_filename (str): Filename for saved chart
+        
+    Returns:
+        str: Filename of the saved chart
+    """
+
+    matplotlib.use("Agg") # workers only save files, so they never need a gui backend
+    fig, ax = plt.subplots(figsize=(5, 5))
+    DataVisualizer.plot_single_dataset_stats_bar(ax, category, describe_df, metrics)
+    fig.tight_layout()
+    fig.savefig(output_filename, dpi=200)
+    plt.close(fig)
+    return output_filename
+
+
 class DataVisualizer:
     """
     Visualizes nutritional data through text displays and charts.
@@ -52,18 +132,20 @@ class DataVisualizer:
         
 
         # print the descriptive stats, one for every category
-        for catergory, stats_df in datasets_dict.items():
-            print("\n")
-            print("="*80)
-            print(f"{catergory.upper()} DESCRIPTIVE STATISTICS")
-            print("="*80)
-
-            print("\nBasic Statistics:")
-            print(stats_df['describe'].round(2))
-
-            print("\nRatios:")
-            for ratio_name, ratio_value in stats_df['ratio'].items():
-                print(f"  {ratio_name:<16}: {ratio_value:.2f}")
+        # each category's report is built first and written in one go, rather than printed line by line
+        for category, stats_df in datasets_dict.items():
+            lines = [
+                "\n",
+                "="*80,
+                f"{category.upper()} DESCRIPTIVE STATISTICS",
+                "="*80,
+                "\nBasic Statistics:",
+                stats_df['describe'].to_string(float_format="%.2f"), # formats to 2 decimals without creating a rounded copy
+                "\nRatios:"
+            ]
+            lines.extend(f"  {ratio_name:<16}: {ratio_value:.2f}" for ratio_name, ratio_value in stats_df['ratio'].items())
+
+            sys.stdout.write("\n".join(lines) + "\n")
 
 
     def print_comparison(self, comparison_dict, metrics=None):
@@ -96,20 +178,21 @@ class DataVisualizer:
         if metrics == None:
             metrics = ['count', 'mean', 'std', 'min', 'max', '25%', '50%', '75%']
 
-        # get the list of catergories and nutrients
+        # get the list of categories and nutrients
         categories = list(comparison_dict.keys())
         nutrients = list(comparison_dict[categories[0]].keys())
 
+        # build one (category, nutrient) x metric table of all the comparison data
+        panel = {(category, nutrient): comparison_dict[category][nutrient] for category in categories for nutrient in nutrients}
+        panel_df = pd.DataFrame.from_dict(panel, orient='index')
+
         # for every metric, print the comparison of nutrients between categories
+        # unstacking sorts the labels, so they are put back in their original order
         for metric in metrics:
-            to_print = {}
-            for category in categories:
-                    to_print[category] = {}
-
-                    for nutrient in nutrients:
-                        to_print[category][nutrient] = comparison_dict[category][nutrient][metric]
-
-            to_print_df = pd.DataFrame(to_print)
+            if panel_df.empty:
+                to_print_df = pd.DataFrame(index=nutrients, columns=categories)
+            else:
+                to_print_df = panel_df[metric].unstack(level=0).reindex(index=nutrients, columns=categories)
 
             print("\n")
             print("-"*80)
@@ -120,12 +203,18 @@ class DataVisualizer:
         print("\n")
 
 
-    def plot_descriptive_stats(self, datasets_dict, metrics=None, output_filename = "descriptive_stats_bar_chart.png"):
+    def plot_descriptive_stats(self, datasets_dict, metrics=None, output_filename = "descriptive_stats_bar_chart.png", interactive=None, parallel=False):
         """
         Create bar chart visualizations of descriptive statistics.
         
         Generates grouped bar charts showing specified metrics for each nutrient,
-        with one subplot per category. Charts are saved as PNG files and displayed.
+        with one subplot per category. Charts are saved as PNG files, and displayed
+        in interactive mode.
+        
+        In parallel mode, each category is instead rendered to its own file
+        (e.g. 'descriptive_stats_bar_chart_food.png') in a separate worker
+        process, which pays off when there are many categories. These charts
+        are only saved, not displayed.
         
         Args:
             datasets_dict (dict): Statistics dictionary from calculate_descriptive_stats()
@@ -133,6 +222,10 @@ class DataVisualizer:
                 If None, plots all available metrics.
             output_filename (str, optional): Filename for saved chart.
                 Default is 'descriptive_stats_bar_chart.png'
+            interactive (bool, optional): Whether to display the chart on screen.
+                If None, follows the AMARIS_INTERACTIVE environment variable.
+            parallel (bool, optional): Whether to render one chart file per
+                category in worker processes. Default is False
         """
          
         # check if theres any descriptive stats to plot
@@ -140,6 +233,25 @@ class DataVisualizer:
         if n == 0:
             print("No data to plot.\n")
             return
+
+        # default metrics
+        # otherwise the stated metrics will be used
+        # and only the stated metrics data will be displayed
+        if metrics == None:
+            metrics = ['count', 'mean', 'std', 'min', 'max', '25%', '50%', '75%']
+
+        # render every category to its own file, in parallel
+        if parallel:
+            root, ext = os.path.splitext(output_filename)
+            categories = list(datasets_dict.keys())
+            describes = [stats_df["describe"] for stats_df in datasets_dict.values()]
+            filenames = [f"{root}_{category}{ext}" for category in categories]
+
+            with ProcessPoolExecutor(max_workers=min(n, os.cpu_count() or 1)) as executor:
+                saved = list(executor.map(_render_category_chart, categories, describes, repeat(metrics), filenames))
+
+            print(f"Bar charts generated for descriptive statistics, successfully saved as {', '.join(saved)}\n")
+            return
         
         # create subplots based on the number of categories
         rows = n
@@ -150,14 +262,8 @@ class DataVisualizer:
         # to be able to index it later on, we need to convert it into a list
         if n == 1:
             axes = [axes]
-
-        # default metrics
-        # otherwise the stated metrics will be used
-        # and only the stated metrics data will be displayed
-        if metrics == None:
-            metrics = ['count', 'mean', 'std', 'min', 'max', '25%', '50%', '75%']
         
-        # plot the descriptive stats bar chart for every catergory
+        # plot the descriptive stats bar chart for every category
         for i, (category, stats_df) in enumerate(datasets_dict.items()):
             ax = axes[i]
 
@@ -172,8 +278,33 @@ class DataVisualizer:
         plt.savefig(output_filename, dpi=200) 
         print(f"Bar chart generated for comparison statistics, successfully saved as {output_filename}\n")
 
-        # show the figure to screen
-        plt.show()
+        # show the figure to screen in interactive mode, otherwise release the figure
+        self.show_or_close(fig, interactive)
+    
+
+    @staticmethod
+    def show_or_close(fig, interactive=None):
+        """
+        Helper function to display a figure on screen, or close it.
+        
+        Displaying needs a GUI backend, which is only selected when the
+        AMARIS_INTERACTIVE environment variable is set. On the non-interactive
+        Agg backend the figure is always closed, since plt.show() would neither
+        display nor free it.
+        
+        Args:
+            fig (matplotlib.figure.Figure): Figure to show or close
+            interactive (bool, optional): Whether to display the figure.
+                If None, follows the AMARIS_INTERACTIVE environment variable.
+        """
+
+        if interactive is None:
+            interactive = INTERACTIVE
+
+        if interactive and matplotlib.get_backend().lower() != 'agg':
+            plt.show()
+        else:
+            plt.close(fig) # frees the figure memory, as it wont be displayed
     
 
     @staticmethod
@@ -191,24 +322,20 @@ class DataVisualizer:
             metrics (list): List of metric names to plot
         """
 
-        # extract the available nutrients columns
+        # extract the available nutrients columns, and the requested metrics available in the stats
         nutrients = describe_df.columns.tolist()
+        present = [metric for metric in metrics if metric in describe_df.index]
 
-        # compute bar width and positions based on the number of nutrients and metrics
-        num_nutrients = len(nutrients)
-        num_metrics = len(metrics)
-        x_pos = np.arange(num_nutrients) # creates the position for each nutrients on the x axis
-        bar_width = 0.8 / num_metrics # bar width for each of the metric for the nutrient
+        # extract the values of all the present metrics in one lookup, one row per metric and one column per nutrient
+        vals = describe_df.loc[present].to_numpy()
 
-        # define the available colors for the bar of the bar chart
-        colors = ["#ff0000", "#0033ff", "#00ff00", "#ff8000", "#ff0080", "#8000ff", "#fffb00", "#00f7ff"]
+        # compute bar width and positions based on the number of nutrients and metrics
+        x_pos = np.arange(len(nutrients)) # creates the position for each nutrients on the x axis
+        positions, bar_width = _bar_layout(vals)
 
-        # for each metric, plot the bar
-        for i, metric in enumerate(metrics):
-            if metric in describe_df.index:
-                values = [describe_df.loc[metric, nutrient] for nutrient in nutrients] # extract metrics value for all the available nutrient column
-                offset = (i - num_metrics/2) * bar_width + bar_width/2 # compute the bar offset to center around the x axis
-                ax.bar(x_pos + offset, values, bar_width, label=metric.capitalize(), color=colors[i]) # plot the bar with the values, offset and color
+        # for each metric, plot the bar with the values, positions and color
+        for i, metric in enumerate(present):
+            ax.bar(positions[i], vals[i], bar_width, label=metric.capitalize(), color=_bar_color(i, len(present)))
 
         # formatting
         ax.set_xlabel('Nutrients', fontsize=10, fontweight='bold')
@@ -221,7 +348,7 @@ class DataVisualizer:
         ax.grid(axis='y') # create grid along the y axis for easier visual reading
 
 
-    def plot_comparison_stats_bar(self, comparison_dict, metrics=None, output_filename = "comparison_stats_bar_chart.png"):
+    def plot_comparison_stats_bar(self, comparison_dict, metrics=None, output_filename = "comparison_stats_bar_chart.png", interactive=None):
         """
         Creates bar chart comparing datasets across metrics.
         
@@ -234,6 +361,8 @@ class DataVisualizer:
             metrics (list, optional): Metrics to plot. If None, plots all metrics.
             output_filename (str, optional): Filename for saved chart.
                 Default is 'comparison_stats_bar_chart.png'
+            interactive (bool, optional): Whether to display the chart on screen.
+                If None, follows the AMARIS_INTERACTIVE environment variable.
         """
 
         # check if theres any comparison stats to plot
@@ -258,15 +387,24 @@ class DataVisualizer:
         if num_metrics == 1:
             axes = [axes]
         
-        # extract the available catergories and nutrients
+        # extract the available categories and nutrients
         categories = list(comparison_dict.keys())
         first_category_dict = list(comparison_dict.values())[0]
         nutrients = list(first_category_dict.keys())
+
+        # extract all the metric values once into a (metrics, categories, nutrients) array
+        # NaN value if metric doesnt exist
+        tensor = np.full((len(metrics), len(categories), len(nutrients)), np.nan)
+        for j, category in enumerate(categories):
+            for k, nutrient in enumerate(nutrients):
+                nutrient_stats = comparison_dict[category][nutrient]
+                for i, metric in enumerate(metrics):
+                    tensor[i, j, k] = nutrient_stats.get(metric, np.nan)
         
         # for each metric, plot a comparison bar chart
         for i, metric in enumerate(metrics):
             ax = axes[i]
-            self.plot_single_comparison_metric(ax, comparison_dict, categories, nutrients, metric)
+            self.plot_single_comparison_metric(ax, tensor[i], categories, nutrients, metric)
         
         # auto adjust subplot spacing to prevent overlapping of details
         plt.tight_layout()
@@ -276,12 +414,12 @@ class DataVisualizer:
         plt.savefig(output_filename, dpi=200)
         print(f"Bar chart generated for comparison statistics, successfully saved as {output_filename}\n")
 
-        # show the figure to screen
-        plt.show()        
+        # show the figure to screen in interactive mode, otherwise release the figure
+        self.show_or_close(fig, interactive)
 
 
     @staticmethod
-    def plot_single_comparison_metric(ax, comparison_dict, categories, nutrients, metric):
+    def plot_single_comparison_metric(ax, metric_slice, categories, nutrients, metric):
         """
         Helper function to plot comparison bar chart for a single metric.
         
@@ -290,26 +428,20 @@ class DataVisualizer:
         
         Args:
             ax (matplotlib.axes.Axes): Subplot axes to draw on
-            comparison_dict (dict): Full comparison data structure
+            metric_slice (np.ndarray): Values of the metric, one row per category
+                and one column per nutrient
             categories (list): List of category names
             nutrients (list): List of nutrient names
             metric (str): Metric name to plot (e.g., 'mean', 'max')
         """
                 
         # compute bar width and positions based on the number of nutrients and categories
-        num_nutrients = len(nutrients)
-        num_categories = len(categories)
-        x_pos = np.arange(num_nutrients) # creates the position for each nutrients on the x axis
-        bar_width = 0.8 / num_categories # bar width for each of the categories
-        
-        # define the available colors for the bar of the bar chart
-        colors = ["#ff0000", "#0033ff", "#00ff00", "#ff8000", "#ff0080", "#8000ff", "#fffb00", "#00f7ff"]
+        x_pos = np.arange(len(nutrients)) # creates the position for each nutrients on the x axis
+        positions, bar_width = _bar_layout(metric_slice)
         
         # for each category, plot the bar
         for i, category in enumerate(categories):
-            values = [comparison_dict[category][nutrient].get(metric, np.nan) for nutrient in nutrients] # extract metrics value for all the available nutrient column for that category, NaN value if metric doesnt exist
-            offset = (i - num_categories/2) * bar_width + bar_width/2
-            ax.bar(x_pos + offset, values, bar_width, label=category.capitalize(), color=colors[i])
+            ax.bar(positions[i], metric_slice[i], bar_width, label=category.capitalize(), color=_bar_color(i, len(categories)))
         
         # formatting
         ax.set_xlabel('Nutrients', fontsize=10, fontweight='bold')
@@ -10,7 +10,43 @@ Classes:
 """
 
 import os
-from groq import Groq
+import functools
+
+# system prompt to define the AI's role, kept constant so every request starts with the same prefix
+SYSTEM_PROMPT = """You are a nutritional analysis expert that provides clear, data-driven insights about Starbucks's food and drink items. 
+
+Guidelines:
+- Analyze the provided dataset to answer user questions about nutritional content
+- Provide specific statistics and comparisons when available
+- Use simple language that general users can understand
+- If the data doesn't contain the requested information, politely inform the user
+- Keep responses concise and focused on the user's question
+- When comparing items or categories, highlight key differences clearly """
+
+# number of completed responses kept per LLMService, the oldest is dropped first
+MAX_CACHED_RESPONSES = 128
+
+
+@functools.lru_cache(maxsize=1)
+def _get_client(api_key):
+    """
+    Helper function to get the shared Groq client for an API key.
+    
+    The Groq SDK is imported on first use rather than at module import, as it
+    is only needed once the chat mode is entered. The client is created once
+    and reused by every LLMService, so requests share the client's pool of
+    kept-alive HTTP connections instead of each opening a new TLS connection.
+    
+    Args:
+        api_key (str): Groq API key
+        
+    Returns:
+        Groq: Groq API client
+    """
+
+    from groq import Groq
+
+    return Groq(api_key=api_key)
 
 class LLMService:
     """
@@ -22,14 +58,16 @@ class LLMService:
     Attributes:
         client (Groq): Initialized Groq API client
         model (str): Model identifier for LLM completions
+        max_tokens (int): Maximum number of tokens in a response
+        temperature (float): Sampling temperature for completions
     """
     
     def __init__(self):
         """
         Initialize LLM service with Groq API.
         
-        Loads API key from environment variables and initializes the Groq client
-        with the llama-3.3-70b-versatile model.
+        Loads API key from environment variables and gets the shared Groq client,
+        using the llama-3.3-70b-versatile model.
         
         Raises:
             ValueError: If GROQ_API_KEY is not found in environment variables
@@ -40,57 +78,125 @@ class LLMService:
         if not api_key: 
             raise ValueError("Groq API key not found in .end file")
         
-        # initialize the groq client and model
-        self.client = Groq(api_key=api_key)
+        # get the shared groq client and initialize the model
+        self.client = _get_client(api_key)
         self.model = "llama-3.3-70b-versatile"
 
+        # set explicitly, so responses stay concise rather than running to the server's limit
+        self.max_tokens = 1024
+        self.temperature = 0.5
+
+        # completed responses, keyed by (prompt, context), capped at MAX_CACHED_RESPONSES
+        self._responses = {}
 
-    def generate_response(self, prompt, context):
+
+    def generate_response(self, prompt, context, stream=False):
         """
         Generate LLM response to a nutritional query.
         
         Sends the user's question along with dataset context to the LLM and
         retrieves an AI-generated response focused on nutritional analysis.
+        The dataset context is sent as a system message ahead of the question,
+        so it forms a stable prefix across turns of the same chat.
         
         Args:
             prompt (str): User's question or query
             context (str): Dataset information to provide to the LLM.
                 Typically includes string representations of DataFrames.
+                Should stay the same between turns, question specific data
+                belongs in the prompt.
+            stream (bool, optional): If True, returns an iterator over the
+                response text as it is generated, instead of waiting for the
+                whole response. Default is False
                 
         Returns:
-            str: LLM-generated response with nutritional insights
+            str or iterator: LLM-generated response with nutritional insights,
+                or an iterator of response text chunks when streaming
             
         Note:
             The LLM is configured with a system prompt that defines it as a
             nutritional analysis expert focused on providing clear, data-driven
             insights about Starbucks menu items.
+            Responses are memoized per (prompt, context) pair, so repeating
+            an identical question does not trigger another API request. Up to
+            MAX_CACHED_RESPONSES responses are kept.
+            An empty prompt returns an empty response without any request.
         """
-        
-        # create the system prompt to define the AI's role
-        system_prompt = """You are a nutritional analysis expert that provides clear, data-driven insights about Starbucks's food and drink items. 
 
-Guidelines:
-- Analyze the provided dataset to answer user questions about nutritional content
-- Provide specific statistics and comparisons when available
-- Use simple language that general users can understand
-- If the data doesn't contain the requested information, politely inform the user
-- Keep responses concise and focused on the user's question
-- When comparing items or categories, highlight key differences clearly """
+        # nothing to answer, so skip the api request
+        if not prompt or not prompt.strip():
+            return iter([]) if stream else ""
 
-        # phrase the full message for the AI to generate response based on it
-        if context: 
-            full_message = f"""Based on the provided data: {context}, answer the following question: {prompt}"""
-        else:
-            full_message = context
+        # reuse the response to an identical earlier request
+        key = (prompt, context)
+        if key in self._responses:
+            return iter([self._responses[key]]) if stream else self._responses[key]
+        
+        # the static parts (system prompt, then dataset context) go first and the question last
+        # so consecutive requests share the same prefix, which lets providers reuse their prompt cache
+        messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+        if context:
+            messages.append({"role": "system", "content": f"Dataset information:\n{context}"})
+        messages.append({"role": "user", "content": prompt})
+
+        if stream:
+            return self._stream_response(key, messages)
 
         # generate the response from the ai
         # with the stated roles and content
         response = self.client.chat.completions.create(
             model=self.model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": full_message}
-            ]
+            messages=messages,
+            max_tokens=self.max_tokens,
+            temperature=self.temperature
+        )
+
+        self._remember(key, response.choices[0].message.content)
+        return self._responses[key]
+
+
+    def _stream_response(self, key, messages):
+        """
+        Helper generator that streams a response from the LLM.
+        
+        Args:
+            key (tuple): (prompt, context) pair the response is memoized under
+            messages (list): Chat messages to send
+            
+        Yields:
+            str: Response text chunks, as they are generated
+        """
+
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+            stream=True
         )
 
-        return response.choices[0].message.content
\ No newline at end of file
+        chunks = []
+        for chunk in response:
+            text = chunk.choices[0].delta.content or ""
+            chunks.append(text)
+            yield text
+
+        # only memoize the response once it has been fully received
+        self._remember(key, "".join(chunks))
+
+
+    def _remember(self, key, text):
+        """
+        Helper function to memoize a completed response.
+        
+        Once MAX_CACHED_RESPONSES responses are stored, the oldest one is
+        dropped, so a long session doesn't grow the memo without bound.
+        
+        Args:
+            key (tuple): (prompt, context) pair the response is memoized under
+            text (str): Completed response text
+        """
+
+        if len(self._responses) >= MAX_CACHED_RESPONSES:
+            del self._responses[next(iter(self._responses))] # dicts keep insertion order, so this is the oldest
+        self._responses[key] = text